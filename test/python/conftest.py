@@ -1,9 +1,13 @@
 """
 Centralized test configuration for ULID extension tests.
 """
+import functools
 import os
 import psycopg2
+import psycopg2.extensions
 import pytest
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # Centralized database configuration
 DB_CONFIG = {
@@ -11,102 +15,241 @@ DB_CONFIG = {
     'port': int(os.getenv('PGPORT', '5432')),
     'database': os.getenv('PGDATABASE', 'postgres'),
     'user': os.getenv('PGUSER', 'postgres'),
-    'password': os.getenv('PGPASSWORD', 'testpass')
+    'password': os.getenv('PGPASSWORD', 'testpass'),
+    # Session GUCs for every suite connection: the suite only writes scratch
+    # tables, so it does not need to wait on WAL flushes at commit; its queries
+    # are tiny, so JIT compilation would cost more than it saves, and prepared
+    # statements keep one generic plan instead of re-planning per parameter
+    'options': '-c synchronous_commit=off -c jit=off -c plan_cache_mode=force_generic_plan',
 }
 
-def exec_one(conn_or_cursor, query, params=None):
-    """Execute a single query and return the first result."""
-    if hasattr(conn_or_cursor, 'cursor'):
-        # It's a connection, create a cursor
-        with conn_or_cursor.cursor() as cursor:
-            cursor.execute(query, params)
-            return cursor.fetchone()[0]
+# Named server-side statements, PREPAREd lazily on each pooled connection
+PREPARED_STATEMENTS = {
+    'oid_time': "PREPARE oid_time(text) AS SELECT objectid_time($1::objectid)",
+    'oid_from_text': "PREPARE oid_from_text(text) AS SELECT $1::objectid",
+    'oid_from_bytea': "PREPARE oid_from_bytea(bytea) AS SELECT $1::objectid",
+    'ulid_once': "PREPARE ulid_once AS SELECT ulid()",
+    'ulid_bytea': "PREPARE ulid_bytea AS SELECT ulid()::bytea",
+    'ulid_text': "PREPARE ulid_text AS SELECT ulid()::text",
+    'ulid_text_len': "PREPARE ulid_text_len AS SELECT length(ulid()::text)",
+    'ulid_batch_count': "PREPARE ulid_batch_count(int) AS SELECT COUNT(*)::int FROM unnest(ulid_batch($1))",
+    'ulid_series_count': "PREPARE ulid_series_count(int) AS SELECT COUNT(ulid())::int FROM generate_series(1, $1)",
+}
+
+# Core generator every ULID suite relies on; probed once per run by pytest_sessionstart.
+# Tests needing any other function declare it with requires_fn and are skipped instead.
+ULID_REQUIRED_FUNCTIONS = ["ulid"]
+
+def _cast_bytea(value, cursor):
+    """Decode bytea columns straight to bytes instead of memoryview."""
+    if value is None:
+        return None
+    if value.startswith('\\x'):
+        # Default bytea_output = hex: decode in C via bytes.fromhex
+        return bytes.fromhex(value[2:])
+    return bytes(psycopg2.BINARY(value, cursor))
+
+BYTEA_AS_BYTES = psycopg2.extensions.new_type(psycopg2.BINARY.values, 'BYTEA_AS_BYTES', _cast_bytea)
+
+class SuiteConnection(psycopg2.extensions.connection):
+    """Connection that returns bytea as bytes, remembers which
+    PREPARED_STATEMENTS it already holds and keeps one cursor for exec_one."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        self._shared_cursor = None
+        psycopg2.extensions.register_type(BYTEA_AS_BYTES, self)
+
+    def shared_cursor(self):
+        """Cursor reused by exec_one/exec_fetchone; each call fetches its row before returning."""
+        if self._shared_cursor is None or self._shared_cursor.closed:
+            self._shared_cursor = self.cursor()
+        return self._shared_cursor
+
+def _execute_prepared(cursor, name, params, prefix=""):
+    """Send (prefix)EXECUTE for a named statement, preparing it on first use for this connection."""
+    conn = cursor.connection
+    if name not in conn.prepared:
+        cursor.execute(PREPARED_STATEMENTS[name])
+        conn.prepared.add(name)
+    if params:
+        placeholders = ', '.join(['%s'] * len(params))
+        cursor.execute(f"{prefix}EXECUTE {name}({placeholders})", params)
     else:
-        # It's already a cursor
-        conn_or_cursor.execute(query, params)
-        return conn_or_cursor.fetchone()[0]
+        cursor.execute(f"{prefix}EXECUTE {name}")
 
-def exec_fetchone(conn_or_cursor, query, params=None):
+def exec_prepared(cursor, name, params=()):
+    """EXECUTE a named statement, preparing it on first use for this connection."""
+    _execute_prepared(cursor, name, params)
+    return cursor.fetchone()[0]
+
+def explain_prepared(cursor, name, params=()):
+    """EXPLAIN ANALYZE a named statement and return its JSON plan; result rows never leave the server."""
+    _execute_prepared(cursor, name, params, prefix="EXPLAIN (ANALYZE, FORMAT JSON) ")
+    return cursor.fetchone()[0][0]
+
+def exec_one_cur(cursor, query, params=None):
+    """Execute a single query on an open cursor and return the first result."""
+    cursor.execute(query, params)
+    return cursor.fetchone()[0]
+
+def exec_one(conn, query, params=None):
+    """Execute a single query and return the first result."""
+    # Checked by attribute: conftest is imported under two module names, so isinstance is unreliable
+    shared_cursor = getattr(conn, 'shared_cursor', None)
+    if shared_cursor is not None:
+        return exec_one_cur(shared_cursor(), query, params)
+    with conn.cursor() as cursor:
+        return exec_one_cur(cursor, query, params)
+
+def exec_fetchone_cur(cursor, query, params=None):
+    """Execute a query on an open cursor and return the first row."""
+    cursor.execute(query, params)
+    return cursor.fetchone()
+
+def exec_fetchone(conn, query, params=None):
     """Execute a query and return the first row."""
-    if hasattr(conn_or_cursor, 'cursor'):
-        # It's a connection, create a cursor
-        with conn_or_cursor.cursor() as cursor:
-            cursor.execute(query, params)
-            return cursor.fetchone()
-    else:
-        # It's already a cursor
-        conn_or_cursor.execute(query, params)
-        return conn_or_cursor.fetchone()
-
-def has_function(conn_or_cursor, function_name):
-    """Check if a function exists in the database."""
-    if hasattr(conn_or_cursor, 'cursor'):
-        # It's a connection, create a cursor
-        with conn_or_cursor.cursor() as cursor:
+    shared_cursor = getattr(conn, 'shared_cursor', None)
+    if shared_cursor is not None:
+        return exec_fetchone_cur(shared_cursor(), query, params)
+    with conn.cursor() as cursor:
+        return exec_fetchone_cur(cursor, query, params)
+
+def exec_values_cur(cursor, query, values):
+    """Expand a 'VALUES %s' query over all value tuples on an open cursor and return every row."""
+    return execute_values(cursor, query, values, page_size=max(len(values), 1), fetch=True)
+
+def exec_values(conn, query, values):
+    """Expand a 'VALUES %s' query over all value tuples in one statement and return every row."""
+    with conn.cursor() as cursor:
+        return exec_values_cur(cursor, query, values)
+
+@functools.lru_cache(maxsize=None)
+def _introspect():
+    """Names of every non-system function and type, read once per process.
+
+    Extension objects do not change during a run, so the session-start check,
+    the requires_fn skips and the ObjectId probe all share this one catalog
+    query. Returns None when ULID_SKIP_INTROSPECTION=1 or the database is unreachable.
+    """
+    if os.getenv('ULID_SKIP_INTROSPECTION') == '1':
+        return None
+    try:
+        # Short connect timeout so an unreachable host returns None instead of hanging collection
+        conn = psycopg2.connect(connect_timeout=2, **DB_CONFIG)
+    except psycopg2.Error:
+        return None  # leave it to the db fixtures to report the connection failure
+    try:
+        with conn.cursor() as cursor:
             cursor.execute("""
-                SELECT EXISTS(
-                    SELECT 1 FROM pg_proc 
-                    WHERE proname = %s
-                )
-            """, (function_name,))
-            return cursor.fetchone()[0]
-    else:
-        # It's already a cursor
-        conn_or_cursor.execute("""
-            SELECT EXISTS(
-                SELECT 1 FROM pg_proc 
-                WHERE proname = %s
-            )
-        """, (function_name,))
-        return conn_or_cursor.fetchone()[0]
-
-def type_exists(conn_or_cursor, type_name):
+                SELECT ARRAY(SELECT DISTINCT proname::text FROM pg_proc
+                             WHERE pronamespace NOT IN ('pg_catalog'::regnamespace, 'information_schema'::regnamespace)),
+                       ARRAY(SELECT DISTINCT typname::text FROM pg_type
+                             WHERE typnamespace NOT IN ('pg_catalog'::regnamespace, 'information_schema'::regnamespace))
+            """)
+            functions, types = cursor.fetchone()
+    finally:
+        conn.close()
+    return frozenset(functions), frozenset(types)
+
+def type_exists(conn, type_name):
     """Check if a type exists in the database."""
-    if hasattr(conn_or_cursor, 'cursor'):
-        # It's a connection, create a cursor
-        with conn_or_cursor.cursor() as cursor:
-            cursor.execute("""
-                SELECT EXISTS(
-                    SELECT 1 FROM pg_type 
-                    WHERE typname = %s
-                )
-            """, (type_name,))
-            return cursor.fetchone()[0]
-    else:
-        # It's already a cursor
-        conn_or_cursor.execute("""
-            SELECT EXISTS(
-                SELECT 1 FROM pg_type 
-                WHERE typname = %s
-            )
-        """, (type_name,))
-        return conn_or_cursor.fetchone()[0]
+    return type_name in find_types(conn, [type_name])
+
+def find_types(conn, type_names):
+    """Return the subset of type_names that exist in the database (one query)."""
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT DISTINCT typname FROM pg_type WHERE typname = ANY(%s)",
+            (list(type_names),),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "requires_fn(*names): skip the test unless every named SQL function exists"
+    )
+    config.addinivalue_line(
+        "markers", "batch_path: ulid_batch() variant of a scalar ulid() test (deselect with -m 'not batch_path')"
+    )
+
+def pytest_sessionstart(session):
+    """Abort the whole run up front if the ULID extension is not installed."""
+    if hasattr(session.config, "workerinput"):
+        return  # xdist worker: the controller process already checked
+    catalog = _introspect()
+    if catalog is None:
+        return
+    functions, types = catalog
+    missing = [name for name in ULID_REQUIRED_FUNCTIONS if name not in functions]
+    if "ulid" not in types:
+        missing.append("type:ulid")
+    if missing:
+        pytest.exit(
+            f"Missing required ULID functions/types: {', '.join(missing)}. "
+            "Install/enable the ULID extension in the test DB (superuser): CREATE EXTENSION ulid;",
+            returncode=pytest.ExitCode.TESTS_FAILED,
+        )
+
+def pytest_collection_modifyitems(config, items):
+    """Skip requires_fn-marked tests at collection time, before any fixture is set up."""
+    wanted = {name for item in items
+              for marker in item.iter_markers("requires_fn") for name in marker.args}
+    catalog = _introspect() if wanted else None
+    if catalog is None:
+        return
+    present, _ = catalog
+    for item in items:
+        missing = [name for marker in item.iter_markers("requires_fn")
+                   for name in marker.args if name not in present]
+        if missing:
+            item.add_marker(pytest.mark.skip(
+                reason=f"{', '.join(f'{name}()' for name in missing)} not available in database"
+            ))
 
 @pytest.fixture(scope="session")
-def db():
-    """Database connection fixture."""
-    conn = psycopg2.connect(**DB_CONFIG)
+def db_pool():
+    """Session-wide connection pool; tests borrow a connection instead of reconnecting."""
+    pool = ThreadedConnectionPool(1, 16, connection_factory=SuiteConnection, **DB_CONFIG)
+    yield pool
+    pool.closeall()
+
+@pytest.fixture
+def db(db_pool):
+    """Database connection fixture, borrowed from the session pool for one test."""
+    conn = db_pool.getconn()
     conn.autocommit = True  # Enable autocommit to avoid transaction issues
-    yield conn
-    conn.close()
+    try:
+        yield conn
+    finally:
+        db_pool.putconn(conn)
 
-@pytest.fixture(scope="session")
-def ulid_functions_available(db):
-    """Detect availability of key ULID functions and return a dict of booleans."""
-    funcs = ["ulid", "ulid_random", "ulid_time", "ulid_parse",
-             "ulid_batch", "ulid_random_batch"]
-    availability = {}
+@pytest.fixture
+def cur(db):
+    """One cursor on the pooled connection, reused for every query in a test."""
     with db.cursor() as cursor:
-        for func in funcs:
-            availability[func] = has_function(cursor, func)
-        availability['ulid_type'] = type_exists(cursor, 'ulid')
-    return availability
+        yield cursor
 
 @pytest.fixture(scope="session")
-def objectid_functions_available(db):
+def objectid_functions_available(db_pool):
     """Check if ObjectId functions are available."""
-    with db.cursor() as cursor:
-        return (
-            has_function(cursor, 'objectid') and
-            type_exists(cursor, 'objectid')
-        )
+    catalog = _introspect()
+    if catalog is not None:
+        functions, types = catalog
+        return "objectid" in functions and "objectid" in types
+    conn = db_pool.getconn()
+    try:
+        # Function and type probed in one round-trip
+        return exec_one(conn, """
+            SELECT EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'objectid')
+               AND EXISTS (SELECT 1 FROM pg_type WHERE typname = 'objectid')
+        """)
+    finally:
+        db_pool.putconn(conn)
+
+@pytest.fixture(scope="session")
+def require_objectid(objectid_functions_available):
+    """Skip every test that uses this fixture when ObjectId is not installed."""
+    if not objectid_functions_available:
+        pytest.skip("ObjectId functions not available")
@@ -14,59 +14,57 @@ The suite will skip tests that rely on missing functions (ulid, ulid_random, etc
 
 from datetime import datetime
 import pytest
-from conftest import exec_one, has_function, type_exists
+from conftest import exec_one_cur, exec_fetchone_cur, exec_prepared, exec_values_cur
 
+# Known-good ULID texts: the spec example, its lowercase spelling and the all-zero minimum
+KNOWN_ULIDS = [
+    "01ARZ3NDEKTSV4RRFFQ69G5FAV",
+    "01arz3ndektsv4rrffq69g5fav",
+    "00000000000000000000000000",
+]
 
 
-def test_basic_generation_and_lengths(db, ulid_functions_available):
-    # Skip if basic ulid function missing
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() function not available in database")
-
-    val = exec_one(db, "SELECT ulid()::text")
+@pytest.mark.requires_fn("ulid")
+def test_basic_generation_and_lengths(cur):
+    val = exec_prepared(cur, 'ulid_text')
     assert val is not None, "ulid() returned NULL"
     assert isinstance(val, str), "ulid() did not return text"
     assert len(val) == 26, f"Expected length 26 for ulid(), got {len(val)}"
 
 
-@pytest.mark.parametrize("fn", ["ulid_random"])
-def test_other_generators_nonnull_and_length(db, ulid_functions_available, fn):
-    if not ulid_functions_available.get(fn):
-        pytest.skip(f"{fn}() not available in database")
-    val = exec_one(db, f"SELECT {fn}()::text")
+@pytest.mark.parametrize("fn", [pytest.param("ulid_random", marks=pytest.mark.requires_fn("ulid_random"))])
+def test_other_generators_nonnull_and_length(cur, fn):
+    val = exec_one_cur(cur, f"SELECT {fn}()::text")
     assert val is not None, f"{fn}() returned NULL"
     assert isinstance(val, str)
     assert len(val) == 26, f"{fn}() length expected 26, got {len(val)}"
 
 
-def test_ulid_time_and_parse(db, ulid_functions_available):
-    if not ulid_functions_available.get("ulid_time"):
-        pytest.skip("ulid_time() not available in database")
-    if not ulid_functions_available.get("ulid_parse"):
-        pytest.skip("ulid_parse() not available in database")
-
-    # specific timestamp: 2022-01-01 00:00:00 UTC -> 1640995200000 ms
-    ut = exec_one(db, "SELECT ulid_time(1640995200000)::text")
-    assert ut is not None
-    assert len(ut) == 26  # canonical form is 26 chars
+@pytest.mark.requires_fn("ulid_time", "ulid_parse")
+def test_ulid_time_and_parse(cur):
+    known = KNOWN_ULIDS[0]
 
-    known = "01ARZ3NDEKTSV4RRFFQ69G5FAV"
-
-    # Fetch both the canonical/text form and the binary form produced by parsing
-    with db.cursor() as cur:
-        cur.execute(
-            """
-            SELECT
-                ulid_parse(%s)::text AS parsed_text,
-                ulid_parse(%s)::bytea AS parsed_bytes,
-                (%s::ulid)::bytea AS direct_bytes
-            """,
-            (known, known, known),
-        )
-        row = cur.fetchone()
+    # Timed generation plus the canonical/text and binary forms produced by parsing, in one statement
+    # (specific timestamp: 2022-01-01 00:00:00 UTC -> 1640995200000 ms)
+    row = exec_fetchone_cur(
+        cur,
+        """
+        WITH p AS (SELECT ulid_parse(%(known)s) AS u)
+        SELECT
+            ulid_time(1640995200000)::text AS timed_text,
+            u::text AS parsed_text,
+            u::bytea AS parsed_bytes,
+            (%(known)s::ulid)::bytea AS direct_bytes
+        FROM p
+        """,
+        {"known": known},
+    )
 
     assert row is not None, "query returned no row"
-    parsed_text, parsed_bytes, direct_bytes = row
+    ut, parsed_text, parsed_bytes, direct_bytes = row
+
+    assert ut is not None
+    assert len(ut) == 26  # canonical form is 26 chars
 
     # The canonical textual representation may differ (encoders normalize to 26 chars),
     # but the underlying 16 bytes must be identical (lossless binary round-trip).
@@ -76,175 +74,144 @@ def test_ulid_time_and_parse(db, ulid_functions_available):
     )
 
 
-def test_readme_basic_generation(db, ulid_functions_available):
+@pytest.mark.requires_fn("ulid")
+def test_readme_basic_generation(cur):
     """Basic ULID generation as documented in README."""
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() function not available in database")
-    
     # Basic generation
-    assert exec_one(db, "SELECT ulid()") is not None
-    assert exec_one(db, "SELECT ulid_random()") is not None
-    assert exec_one(db, "SELECT ulid_random()") is not None
+    generated, random1, random2 = exec_fetchone_cur(cur, "SELECT ulid(), ulid_random(), ulid_random()")
+    assert generated is not None
+    assert random1 is not None
+    assert random2 is not None
 
 
-def test_readme_time_based_generation(db, ulid_functions_available):
+@pytest.mark.requires_fn("ulid_time", "ulid_generate_with_timestamp")
+def test_readme_time_based_generation(cur):
     """Time-based ULID generation as documented in README."""
-    if not ulid_functions_available.get("ulid_time"):
-        pytest.skip("ulid_time() not available in database")
-    if not ulid_functions_available.get("ulid_generate_with_timestamp"):
-        pytest.skip("ulid_generate_with_timestamp() not available in database")
-    
     # Time-based generation
-    assert exec_one(db, "SELECT ulid_time(1609459200000)") is not None
-    assert exec_one(db, "SELECT ulid_generate_with_timestamp(1609459200000)") is not None
+    timed, with_timestamp = exec_fetchone_cur(
+        cur, "SELECT ulid_time(1609459200000), ulid_generate_with_timestamp(1609459200000)"
+    )
+    assert timed is not None
+    assert with_timestamp is not None
 
 
-def test_readme_parsing_and_timestamp_extraction(db, ulid_functions_available):
+@pytest.mark.requires_fn("ulid_parse", "ulid_timestamp")
+def test_readme_parsing_and_timestamp_extraction(cur):
     """Parsing and timestamp extraction as documented in README."""
-    if not ulid_functions_available.get("ulid_parse"):
-        pytest.skip("ulid_parse() not available in database")
-    if not ulid_functions_available.get("ulid_timestamp"):
-        pytest.skip("ulid_timestamp() not available in database")
-    
-    # Parsing and timestamp extraction
-    assert exec_one(db, "SELECT ulid_parse('01ARZ3NDEKTSV4RRFFQ69G5FAV')") is not None
-    ts_ms = exec_one(db, "SELECT ulid_timestamp('01ARZ3NDEKTSV4RRFFQ69G5FAV')")
-    assert ts_ms is not None and isinstance(ts_ms, (int, float))
-
-
-def test_readme_batch_generation(db, ulid_functions_available):
+    # Parsing and timestamp extraction for every known ULID, in one VALUES batch
+    rows = exec_values_cur(
+        cur,
+        "SELECT v, ulid_parse(v), ulid_timestamp(v::ulid) FROM (VALUES %s) AS t(v)",
+        [(known,) for known in KNOWN_ULIDS],
+    )
+    assert len(rows) == len(KNOWN_ULIDS)
+    for known, parsed, ts_ms in rows:
+        assert parsed is not None, f"ulid_parse({known!r}) returned NULL"
+        assert ts_ms is not None and isinstance(ts_ms, (int, float))
+
+
+@pytest.mark.requires_fn("ulid_batch", "ulid_random_batch")
+def test_readme_batch_generation(cur):
     """Batch generation as documented in README."""
-    if not ulid_functions_available.get("ulid_batch"):
-        pytest.skip("ulid_batch() not available in database")
-    if not ulid_functions_available.get("ulid_random_batch"):
-        pytest.skip("ulid_random_batch() not available in database")
-    
     # Batch generation
-    assert exec_one(db, "SELECT array_length(ulid_batch(5), 1)") == 5
-    assert exec_one(db, "SELECT array_length(ulid_random_batch(3), 1)") == 3
+    batch_len, random_batch_len = exec_fetchone_cur(
+        cur, "SELECT array_length(ulid_batch(5), 1), array_length(ulid_random_batch(3), 1)"
+    )
+    assert batch_len == 5
+    assert random_batch_len == 3
 
 
-def test_readme_casting_operations(db, ulid_functions_available):
+@pytest.mark.requires_fn("ulid")
+def test_readme_casting_operations(cur):
     """Casting operations as documented in README."""
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() function not available in database")
-    
+    # Every README cast in one statement
+    row = exec_fetchone_cur(
+        cur,
+        """
+        SELECT
+            '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid IS NOT NULL,
+            ulid()::text,
+            '2023-09-15 12:00:00'::timestamp::ulid IS NOT NULL,
+            ulid()::timestamp,
+            ulid()::timestamptz IS NOT NULL,
+            ulid()::uuid IS NOT NULL,
+            '550e8400-e29b-41d4-a716-446655440000'::uuid::ulid IS NOT NULL
+        """,
+    )
+    text_cast, text_val, ts_cast, ts_val, tstz_ok, uuid_ok, from_uuid = row
+
     # Text casting
-    assert exec_one(db, "SELECT '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid") is not None
-    
+    assert text_cast is True
+
     # ULID to text
-    text_val = exec_one(db, "SELECT ulid()::text")
     assert text_val is not None and isinstance(text_val, str) and len(text_val) == 26
-    
+
     # Timestamp casting
-    assert exec_one(db, "SELECT '2023-09-15 12:00:00'::timestamp::ulid") is not None
-    
+    assert ts_cast is True
+
     # ULID to timestamp
-    ts_val = exec_one(db, "SELECT ulid()::timestamp")
     assert ts_val is not None and isinstance(ts_val, datetime)
-    
+
     # Other casting operations
-    assert exec_one(db, "SELECT ulid()::timestamptz") is not None
-    assert exec_one(db, "SELECT ulid()::uuid") is not None
-    assert exec_one(db, "SELECT '550e8400-e29b-41d4-a716-446655440000'::uuid::ulid") is not None
+    assert tstz_ok is True
+    assert uuid_ok is True
+    assert from_uuid is True
 
 
-def test_uniqueness_small_batch(db, ulid_functions_available):
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() not available in database")
+@pytest.mark.requires_fn("ulid_batch")
+def test_uniqueness_small_batch(cur):
+    # Probe uniqueness through the batch path; the check stops at the first duplicate
     q = """
-    WITH test_ulids AS (
-      SELECT ulid()::text AS u
-      FROM generate_series(1, 100)
+    SELECT NOT EXISTS (
+        SELECT 1 FROM unnest(ulid_batch(100)) AS u GROUP BY u HAVING count(*) > 1
     )
-    SELECT (COUNT(*) = COUNT(DISTINCT u))::boolean FROM test_ulids
     """
-    all_unique = exec_one(db, q)
+    all_unique = exec_one_cur(cur, q)
     assert all_unique is True
 
 
-def test_batch_generation_and_uniqueness(db, ulid_functions_available):
-    if not ulid_functions_available.get("ulid_batch"):
-        pytest.skip("ulid_batch() not available in database")
-    count = exec_one(db, "SELECT array_length(ulid_batch(5), 1)")
-    assert count == 5
-
-    # uniqueness check
-    if not ulid_functions_available.get("ulid_batch"):
-        pytest.skip("ulid_batch() not available in database")
-    unique_ok = exec_one(
-        db,
+@pytest.mark.requires_fn("ulid_batch")
+def test_batch_generation_and_uniqueness(cur):
+    # Length of one batch and uniqueness of another, checked on the arrays in one query
+    count, unique_ok = exec_fetchone_cur(
+        cur,
         """
-        WITH batch_test AS (
-            SELECT unnest(ulid_batch(10))::text AS u
-        )
-        SELECT (COUNT(*) = COUNT(DISTINCT u))::boolean FROM batch_test
+        SELECT cardinality(b5),
+               NOT EXISTS (SELECT 1 FROM unnest(b10) AS u GROUP BY u HAVING count(*) > 1)
+        FROM (SELECT ulid_batch(5) AS b5, ulid_batch(10) AS b10) AS batch_test
         """,
     )
+    assert count == 5
     assert unique_ok is True
 
 
-def test_generators_produce_different_values(db, ulid_functions_available):
+@pytest.mark.requires_fn("ulid", "ulid_random")
+def test_generators_produce_different_values(cur):
     # We require ulid and at least one other generator for a meaningful test
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() not available in database")
-    if not ulid_functions_available.get("ulid_random"):
-        pytest.skip("ulid_random() not available in database")
 
     # Compare to ulid_random
-    different = exec_one(db, "SELECT (ulid()::text <> ulid_random()::text)::boolean")
+    different = exec_one_cur(cur, "SELECT (ulid()::text <> ulid_random()::text)::boolean")
     assert different is True
 
 
-def test_length_bounds(db, ulid_functions_available):
-    if not ulid_functions_available.get("ulid"):
-        pytest.skip("ulid() not available in database")
-    length = exec_one(db, "SELECT length(ulid()::text)")
+@pytest.mark.requires_fn("ulid")
+def test_length_bounds(cur):
+    length = exec_prepared(cur, 'ulid_text_len')
     assert length > 20
     assert length < 30
 
 
-def test_text_equality_and_consecutive_difference(db):
+def test_text_equality_and_consecutive_difference(cur):
     # Parsing/casting equality test uses ulid cast; skip if type/extension not present
     try:
-        eq = exec_one(db, "SELECT ('01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid = '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid)::boolean")
+        eq = exec_one_cur(cur, "SELECT ('01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid = '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid)::boolean")
     except Exception:
         pytest.skip("ulid type or casting not available in database for equality test")
     assert eq is True
 
     # Consecutive ulid() differentiation
     try:
-        diff = exec_one(db, "SELECT (ulid()::text <> ulid()::text)::boolean")
+        diff = exec_one_cur(cur, "SELECT (ulid()::text <> ulid()::text)::boolean")
     except Exception:
         pytest.skip("ulid() not available for consecutive difference check")
     assert diff is True
-
-
-
-def test_required_ulid_functions_and_types_present(db):
-    """Fail early if required ULID functions or the ulid type are missing."""
-    required_funcs = [
-        "ulid",
-        "ulid_random",
-        "ulid_time",
-        "ulid_parse",
-        "ulid_batch",
-        "ulid_random_batch",
-        "ulid_timestamp",
-        "ulid_generate_with_timestamp",
-    ]
-    with db.cursor() as cursor:
-        missing = [f for f in required_funcs if not has_function(cursor, f)]
-
-        if not type_exists(cursor, "ulid"):
-            missing.append("type:ulid")
-
-    if missing:
-        hint = (
-            "Install/enable the ULID extension or add missing functions/types in the test DB. "
-            "Example (superuser): CREATE EXTENSION ulid;"
-        )
-        pytest.fail(
-            f"Missing required ULID functions/types: {', '.join(missing)}. {hint}",
-            pytrace=False,
-        )
@@ -12,38 +12,40 @@ Run: pytest -q test_ulid_casting_pytest.py
 """
 
 from datetime import datetime, timezone
-from conftest import exec_one
+from conftest import exec_one_cur, exec_fetchone_cur, exec_prepared
 
-def test_text_to_ulid_and_back_casting(db):
+# Fixed input for test_direct_timestamp_to_ulid_casting, built once at import
+DIRECT_CAST_DATE = datetime(2025, 7, 24)
+
+
+def test_text_to_ulid_and_back_casting(cur):
     """Text to ULID and ULID to text casting should work and preserve value."""
+    val, text_val = exec_fetchone_cur(cur, "SELECT '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid, ulid()::text")
+
     # Text -> ulid cast
-    val = exec_one(db, "SELECT '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid")
     assert val is not None, "Text to ULID casting returned NULL"
 
     # ULID -> text cast length
-    text_val = exec_one(db, "SELECT ulid()::text")
     assert text_val is not None, "ULID to text casting returned NULL"
     assert isinstance(text_val, str), "ULID to text did not return a string"
     assert len(text_val) == 26, f"ULID to text expected length 26, got {len(text_val)}"
 
 
-def test_text_round_trip_preserves_value(db):
+def test_text_round_trip_preserves_value(cur):
     """Text -> ULID -> text: canonical text may change, but bytes must be identical."""
     q = """
         WITH round_trip_test AS (
             SELECT
                 '01ARZ3NDEKTSV4RRFFQ69G5FAV'::text AS original_text,
-                '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid::text AS canonical_text,
-                '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid::bytea AS parsed_bytes,
-                ('01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid::text)::ulid::bytea AS roundtrip_parsed_bytes
+                '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid AS u
         )
-        SELECT original_text, canonical_text, parsed_bytes, roundtrip_parsed_bytes
+        SELECT original_text, u::text AS canonical_text, u::bytea AS parsed_bytes,
+               u::text::ulid::bytea AS roundtrip_parsed_bytes
         FROM round_trip_test
     """
 
-    with db.cursor() as cur:
-        cur.execute(q)
-        r = cur.fetchone()
+    cur.execute(q)
+    r = cur.fetchone()
 
     assert r is not None, "round-trip query returned no row"
     original_text, canonical_text, parsed_bytes, roundtrip_parsed_bytes = r
@@ -60,19 +62,19 @@ def test_text_round_trip_preserves_value(db):
     )
 
 
-def test_timestamp_to_ulid_and_ulid_to_timestamp_casting(db):
+def test_timestamp_to_ulid_and_ulid_to_timestamp_casting(cur):
     """Timestamp -> ULID and ULID -> timestamp casting should work."""
+    ul, ts = exec_fetchone_cur(cur, "SELECT '2023-09-15 12:00:00'::timestamp::ulid, ulid()::timestamp")
+
     # Timestamp -> ulid
-    ul = exec_one(db, "SELECT '2023-09-15 12:00:00'::timestamp::ulid")
     assert ul is not None, "Timestamp to ULID casting returned NULL"
 
     # ulid -> timestamp
-    ts = exec_one(db, "SELECT ulid()::timestamp")
     assert ts is not None, "ULID to timestamp casting returned NULL"
     assert isinstance(ts, datetime), "ULID->timestamp did not return datetime"
 
 
-def test_timestamp_round_trip_preserves_value_with_tolerance(db):
+def test_timestamp_round_trip_preserves_value_with_tolerance(cur):
     """Timestamp -> ULID -> timestamp round-trip should preserve timestamp (small tolerance allowed)."""
     q = """
         WITH timestamp_round_trip AS (
@@ -82,28 +84,27 @@ def test_timestamp_round_trip_preserves_value_with_tolerance(db):
         )
         SELECT original_timestamp, round_trip_timestamp FROM timestamp_round_trip
     """
-    with db.cursor() as cur:
-        cur.execute(q)
-        orig, round_trip = cur.fetchone()
+    cur.execute(q)
+    orig, round_trip = cur.fetchone()
     assert isinstance(orig, datetime) and isinstance(round_trip, datetime)
     diff = abs((orig - round_trip).total_seconds())
     assert diff < 1, f"Timestamp round-trip difference too large: {diff}s"
 
 
-def test_ulid_timestamp_round_trip_preserves_timestamp(db):
+def test_ulid_timestamp_round_trip_preserves_timestamp(cur):
     """ULID -> timestamp -> ULID round-trip should preserve timestamp-related data."""
     q = """
         WITH ulid_timestamp_round_trip AS (
             SELECT
-                '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid AS original_ulid,
-                ulid_generate_with_timestamp(ulid_timestamp('01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid)) AS round_trip_ulid,
-                ulid_timestamp(ulid_generate_with_timestamp(ulid_timestamp('01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid))) AS round_trip_ts_ms
+                original_ulid,
+                ulid_generate_with_timestamp(ulid_timestamp(original_ulid)) AS round_trip_ulid
+            FROM (SELECT '01ARZ3NDEKTSV4RRFFQ69G5FAV'::ulid AS original_ulid) AS s
         )
-        SELECT original_ulid, round_trip_ulid, round_trip_ts_ms FROM ulid_timestamp_round_trip
+        SELECT original_ulid, round_trip_ulid, ulid_timestamp(round_trip_ulid) AS round_trip_ts_ms
+        FROM ulid_timestamp_round_trip
     """
-    with db.cursor() as cur:
-        cur.execute(q)
-        r = cur.fetchone()
+    cur.execute(q)
+    r = cur.fetchone()
     assert r is not None, "ULID timestamp round-trip returned no result"
     original_ulid, round_trip_ulid, round_trip_ts_ms = r
     assert original_ulid is not None
@@ -114,33 +115,30 @@ def test_ulid_timestamp_round_trip_preserves_timestamp(db):
     assert round_trip_ts_ms > 0, "round_trip_ts_ms is not positive"
 
 
-def test_timestamptz_casting(db):
+def test_timestamptz_casting(cur):
     """ULID -> timestamptz casting should produce a timestamptz/datetime with tzinfo (or interpreted as UTC)."""
-    val = exec_one(db, "SELECT ulid()::timestamptz")
+    val = exec_one_cur(cur, "SELECT ulid()::timestamptz")
     assert val is not None, "ULID to timestamptz casting returned NULL"
     assert isinstance(val, datetime), "ULID::timestamptz did not return datetime"
     # psycopg2 may return naive datetime for timestamptz depending on settings; ensure it can be interpreted
     # we at least check it's a datetime object
 
 
-def test_uuid_and_back_casting(db):
+def test_uuid_and_back_casting(cur):
     """ULID <-> UUID casting should be supported in both directions (if semantically meaningful)."""
-    u = exec_one(db, "SELECT ulid()::uuid")
+    u, back = exec_fetchone_cur(cur, "SELECT ulid()::uuid, '550e8400-e29b-41d4-a716-446655440000'::uuid::ulid")
     assert u is not None, "ULID to UUID casting returned NULL"
-
-    back = exec_one(db, "SELECT '550e8400-e29b-41d4-a716-446655440000'::uuid::ulid")
     assert back is not None, "UUID to ULID casting returned NULL"
 
 
-def test_ulid_inequality(db):
+def test_ulid_inequality(cur):
     """Two ULID() invocations should produce distinct values (inequality)."""
-    with db.cursor() as cur:
-        cur.execute("SELECT ulid() as u1, ulid() as u2")
-        r = cur.fetchone()
+    cur.execute("SELECT ulid() as u1, ulid() as u2")
+    r = cur.fetchone()
     assert r is not None and r[0] != r[1], "Two consecutive ulid() calls returned equal values"
 
 
-def test_timestamp_extraction_accuracy(db):
+def test_timestamp_extraction_accuracy(cur):
     """ulid_timestamp(ulid) should extract a timestamp close to the original timestamp used to build the ULID."""
     q = """
         WITH timestamp_test AS (
@@ -150,9 +148,8 @@ def test_timestamp_extraction_accuracy(db):
         )
         SELECT original_timestamp, extracted_timestamp_ms FROM timestamp_test
     """
-    with db.cursor() as cur:
-        cur.execute(q)
-        orig, extracted_ms = cur.fetchone()
+    cur.execute(q)
+    orig, extracted_ms = cur.fetchone()
     assert isinstance(orig, datetime)
     assert isinstance(extracted_ms, (int, float))
     extracted_dt = datetime.fromtimestamp(extracted_ms / 1000.0, tz=timezone.utc).replace(tzinfo=None)
@@ -162,24 +159,21 @@ def test_timestamp_extraction_accuracy(db):
     assert diff < 1, f"Timestamp extraction difference too large: {diff}s"
 
 
-def test_ulid_text_length(db):
+def test_ulid_text_length(cur):
     """ulid() as text should be exactly 26 characters."""
-    length = exec_one(db, "SELECT length(ulid()::text)")
+    length = exec_prepared(cur, 'ulid_text_len')
     assert length == 26, f"Expected ULID text length 26, got {length}"
 
 
-def test_batch_casting_uniqueness(db):
+def test_batch_casting_uniqueness(cur):
     """Unnesting ulid_batch should produce the requested number of unique ULIDs."""
+    # Both counts come off the array itself; no row set is built for COUNT()
     sql = """
-    WITH batch_test AS (
-        SELECT unnest(ulid_batch(5)) AS u
-    )
-    SELECT COUNT(*)::int AS total, COUNT(DISTINCT u)::int AS unique_count
-    FROM batch_test
+    SELECT cardinality(b) AS total, cardinality(ARRAY(SELECT DISTINCT unnest(b))) AS unique_count
+    FROM (SELECT ulid_batch(5) AS b) AS batch_test
     """
-    with db.cursor() as cur:
-        cur.execute(sql)
-        row = cur.fetchone()
+    cur.execute(sql)
+    row = cur.fetchone()
 
     assert row is not None, "query returned no row"
     total, unique = row
@@ -187,19 +181,19 @@ def test_batch_casting_uniqueness(db):
     assert total == 5, f"Expected total 5 from ulid_batch(5), got {total}"
     assert unique == 5, f"Expected 5 unique ULIDs from ulid_batch(5), got {unique}"
 
-def test_null_ulid_casting(db):
+def test_null_ulid_casting(cur):
     """NULL::ulid should return SQL NULL (maps to Python None)."""
-    val = exec_one(db, "SELECT NULL::ulid")
+    val = exec_one_cur(cur, "SELECT NULL::ulid")
     assert val is None, "NULL::ulid did not produce NULL"
 
 
-def test_epoch_timestamp_casting(db):
+def test_epoch_timestamp_casting(cur):
     """Epoch timestamp (1970-01-01) cast to ULID should succeed."""
-    ul = exec_one(db, "SELECT '1970-01-01 00:00:00'::timestamp::ulid")
+    ul = exec_one_cur(cur, "SELECT '1970-01-01 00:00:00'::timestamp::ulid")
     assert ul is not None, "Epoch timestamp to ULID casting returned NULL"
 
 
-def test_comprehensive_casts_report(db):
+def test_comprehensive_casts_report(cur):
     """Verify a set of casting operations don't return NULL (reporting test)."""
     q = """
         SELECT
@@ -208,38 +202,26 @@ def test_comprehensive_casts_report(db):
             (ulid()::timestamptz IS NOT NULL) AS timestamptz_cast_works,
             (ulid()::uuid IS NOT NULL) AS uuid_cast_works
     """
-    with db.cursor() as cur:
-        cur.execute(q)
-        r = cur.fetchone()
+    cur.execute(q)
+    r = cur.fetchone()
     assert r is not None and all(r), f"Not all comprehensive casting operations succeeded: {r}"
 
-def test_direct_timestamp_to_ulid_casting(db):
+def test_direct_timestamp_to_ulid_casting(cur):
     """Test direct timestamp to ULID casting (should be faster than chained)."""
-    test_timestamp = '2025-07-24'
+    # Cast the timestamp and read it back off the same ULID in one statement
+    ulid_result, back_to_timestamp = exec_fetchone_cur(cur, """
+        WITH x AS (SELECT %s::timestamp::ulid AS u)
+        SELECT u, u::timestamp FROM x
+    """, (DIRECT_CAST_DATE,))
+    assert ulid_result is not None, "ULID result is NULL"
+    assert back_to_timestamp is not None, "ULID to timestamp conversion failed"
     
-    with db.cursor() as cur:
-        # Test direct casting
-        cur.execute(f"SELECT '{test_timestamp}'::timestamp::ulid as result")
-        result = cur.fetchone()
-        assert result is not None, "Direct casting returned NULL"
-        
-        ulid_result = result[0]
-        assert ulid_result is not None, "ULID result is NULL"
-        
-        # Verify the ULID can be converted back to timestamp
-        cur.execute("SELECT %s::ulid::timestamp as back_to_timestamp", (ulid_result,))
-        back_to_timestamp = cur.fetchone()[0]
-        assert back_to_timestamp is not None, "ULID to timestamp conversion failed"
-        
-        # The timestamp should be close to the original
-        original_ts = datetime.strptime(test_timestamp, '%Y-%m-%d')
-        diff_seconds = abs((back_to_timestamp - original_ts).total_seconds())
-        assert diff_seconds < 1.0, f"Timestamp conversion error: {diff_seconds} seconds difference"
-        
-        print(f"✅ Direct casting works: '{test_timestamp}'::timestamp::ulid = {ulid_result}")
+    # The timestamp should be close to the original
+    diff_seconds = abs((back_to_timestamp - DIRECT_CAST_DATE).total_seconds())
+    assert diff_seconds < 1.0, f"Timestamp conversion error: {diff_seconds} seconds difference"
 
 
-def test_comprehensive_round_trip_tests(db):
+def test_comprehensive_round_trip_tests(cur):
     """Comprehensive round-trip tests for all possible ULID casting combinations."""
     
     # Test data
@@ -252,12 +234,12 @@ def test_comprehensive_round_trip_tests(db):
     def test_text_round_trips():
         """Text -> ULID -> Text round-trips."""
         # Text -> ULID -> Text (may normalize)
-        result = exec_one(db, "SELECT %s::ulid::text", (test_ulid,))
+        result = exec_one_cur(cur, "SELECT %s::ulid::text", (test_ulid,))
         assert result is not None
         assert len(result) == 26
         
         # Text -> ULID -> Text (round-trip test)
-        result = exec_one(db, "SELECT %s::ulid::text::ulid::text", (test_ulid,))
+        result = exec_one_cur(cur, "SELECT %s::ulid::text::ulid::text", (test_ulid,))
         assert result is not None
         assert len(result) == 26
     
@@ -265,12 +247,12 @@ def test_comprehensive_round_trip_tests(db):
     def test_timestamp_round_trips():
         """Timestamp -> ULID -> Timestamp round-trips."""
         # Timestamp -> ULID -> Timestamp (with tolerance)
-        result = exec_one(db, "SELECT %s::timestamp::ulid::timestamp", (test_timestamp,))
+        result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::timestamp", (test_timestamp,))
         assert result is not None
         assert isinstance(result, datetime)
         
         # Timestamp -> ULID -> Timestamptz (should work)
-        result = exec_one(db, "SELECT %s::timestamp::ulid::timestamptz", (test_timestamp,))
+        result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::timestamptz", (test_timestamp,))
         assert result is not None
         assert isinstance(result, datetime)
     
@@ -278,12 +260,12 @@ def test_comprehensive_round_trip_tests(db):
     def test_timestamptz_round_trips():
         """Timestamptz -> ULID -> Timestamptz round-trips."""
         # Timestamptz -> ULID -> Timestamptz
-        result = exec_one(db, "SELECT %s::timestamptz::ulid::timestamptz", (test_timestamptz,))
+        result = exec_one_cur(cur, "SELECT %s::timestamptz::ulid::timestamptz", (test_timestamptz,))
         assert result is not None
         assert isinstance(result, datetime)
         
         # Timestamptz -> ULID -> Timestamp (should work)
-        result = exec_one(db, "SELECT %s::timestamptz::ulid::timestamp", (test_timestamptz,))
+        result = exec_one_cur(cur, "SELECT %s::timestamptz::ulid::timestamp", (test_timestamptz,))
         assert result is not None
         assert isinstance(result, datetime)
     
@@ -291,11 +273,11 @@ def test_comprehensive_round_trip_tests(db):
     def test_uuid_round_trips():
         """UUID -> ULID -> UUID round-trips."""
         # UUID -> ULID -> UUID
-        result = exec_one(db, "SELECT %s::uuid::ulid::uuid", (test_uuid,))
+        result = exec_one_cur(cur, "SELECT %s::uuid::ulid::uuid", (test_uuid,))
         assert result is not None
         
         # UUID -> ULID -> Text -> UUID (via text)
-        result = exec_one(db, "SELECT %s::uuid::ulid::text::ulid::uuid", (test_uuid,))
+        result = exec_one_cur(cur, "SELECT %s::uuid::ulid::text::ulid::uuid", (test_uuid,))
         assert result is not None
     
     # 5. Bytea round-trips
@@ -303,12 +285,12 @@ def test_comprehensive_round_trip_tests(db):
         """Bytea round-trips (ULID -> bytea -> ULID)."""
         # Note: Direct bytea::ulid casting is not supported in current implementation
         # Test ULID -> bytea conversion (should work)
-        result = exec_one(db, "SELECT %s::ulid::bytea", (test_ulid,))
+        result = exec_one_cur(cur, "SELECT %s::ulid::bytea", (test_ulid,))
         assert result is not None
         assert len(result) == 16  # 16 bytes for ULID
         
         # Test that bytea conversion preserves the binary representation
-        binary_repr = exec_one(db, "SELECT %s::ulid::bytea", (test_ulid,))
+        binary_repr = exec_one_cur(cur, "SELECT %s::ulid::bytea", (test_ulid,))
         assert binary_repr is not None
         assert len(binary_repr) == 16
     
@@ -316,17 +298,17 @@ def test_comprehensive_round_trip_tests(db):
     def test_complex_round_trips():
         """Complex multi-step round-trips."""
         # Text -> ULID -> Timestamp -> ULID -> Text
-        result = exec_one(db, "SELECT %s::ulid::timestamp::ulid::text", (test_ulid,))
+        result = exec_one_cur(cur, "SELECT %s::ulid::timestamp::ulid::text", (test_ulid,))
         assert result is not None
         assert len(result) == 26
         
         # Text -> ULID -> UUID -> ULID -> Text
-        result = exec_one(db, "SELECT %s::ulid::uuid::ulid::text", (test_ulid,))
+        result = exec_one_cur(cur, "SELECT %s::ulid::uuid::ulid::text", (test_ulid,))
         assert result is not None
         assert len(result) == 26
         
         # Timestamp -> ULID -> UUID -> ULID -> Timestamp
-        result = exec_one(db, "SELECT %s::timestamp::ulid::uuid::ulid::timestamp", (test_timestamp,))
+        result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::uuid::ulid::timestamp", (test_timestamp,))
         assert result is not None
         assert isinstance(result, datetime)
     
@@ -336,12 +318,12 @@ def test_comprehensive_round_trip_tests(db):
         # Note: timestamp doesn't round-trip to itself, but does round-trip to timestamptz
         
         # Timestamp -> ULID -> Timestamptz -> ULID -> Timestamp
-        result = exec_one(db, "SELECT %s::timestamp::ulid::timestamptz::ulid::timestamp", (test_timestamp,))
+        result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::timestamptz::ulid::timestamp", (test_timestamp,))
         assert result is not None
         assert isinstance(result, datetime)
         
         # Timestamptz -> ULID -> Timestamp -> ULID -> Timestamptz
-        result = exec_one(db, "SELECT %s::timestamptz::ulid::timestamp::ulid::timestamptz", (test_timestamptz,))
+        result = exec_one_cur(cur, "SELECT %s::timestamptz::ulid::timestamp::ulid::timestamptz", (test_timestamptz,))
         assert result is not None
         assert isinstance(result, datetime)
     
@@ -349,14 +331,14 @@ def test_comprehensive_round_trip_tests(db):
     def test_edge_case_round_trips():
         """Edge case round-trips."""
         # NULL handling
-        assert exec_one(db, "SELECT NULL::ulid::text") is None
-        assert exec_one(db, "SELECT NULL::ulid::timestamp") is None
-        assert exec_one(db, "SELECT NULL::ulid::uuid") is None
-        assert exec_one(db, "SELECT NULL::ulid::bytea") is None
+        assert exec_one_cur(cur, "SELECT NULL::ulid::text") is None
+        assert exec_one_cur(cur, "SELECT NULL::ulid::timestamp") is None
+        assert exec_one_cur(cur, "SELECT NULL::ulid::uuid") is None
+        assert exec_one_cur(cur, "SELECT NULL::ulid::bytea") is None
         
         # Empty string handling
         try:
-            result = exec_one(db, "SELECT ''::ulid::text")
+            result = exec_one_cur(cur, "SELECT ''::ulid::text")
             assert result is None or len(result) == 26
         except Exception:
             # Expected for invalid ULID
@@ -373,14 +355,11 @@ def test_comprehensive_round_trip_tests(db):
     test_edge_case_round_trips()
 
 
-def test_round_trip_preservation_verification(db):
+def test_round_trip_preservation_verification(cur):
     """Verify that round-trips preserve the essential ULID properties."""
     
-    # Ensure clean transaction state
-    db.rollback()
-    
     # Generate a fresh ULID for testing
-    original_ulid = exec_one(db, "SELECT ulid()")
+    original_ulid = exec_one_cur(cur, "SELECT ulid()")
     assert original_ulid is not None
     
     # Test that various round-trips preserve the ULID
@@ -393,7 +372,7 @@ def test_round_trip_preservation_verification(db):
     
     for description, sql_template in round_trip_tests:
         try:
-            result = exec_one(db, sql_template, (original_ulid,))
+            result = exec_one_cur(cur, sql_template, (original_ulid,))
             if "Bytea" in description:
                 # For bytea, check it's 16 bytes
                 assert result is not None, f"{description} returned NULL"
@@ -407,28 +386,24 @@ def test_round_trip_preservation_verification(db):
         except Exception as e:
             # Some round-trips may not be supported or may have precision loss
             print(f"⚠️  {description}: {e}")
-            db.rollback()  # Clean up transaction state
 
 
-def test_timestamp_precision_round_trips(db):
+def test_timestamp_precision_round_trips(cur):
     """Test timestamp precision in round-trips (timestamp vs timestamptz)."""
     
-    # Ensure clean transaction state
-    db.rollback()
-    
     # Test with a specific timestamp
     test_ts = "2023-09-15 12:30:45.123456"
     
     # Timestamp -> ULID -> Timestamp (may lose precision)
-    ts_result = exec_one(db, "SELECT %s::timestamp::ulid::timestamp", (test_ts,))
+    ts_result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::timestamp", (test_ts,))
     assert ts_result is not None
     
     # Timestamp -> ULID -> Timestamptz (should preserve better)
-    tstz_result = exec_one(db, "SELECT %s::timestamp::ulid::timestamptz", (test_ts,))
+    tstz_result = exec_one_cur(cur, "SELECT %s::timestamp::ulid::timestamptz", (test_ts,))
     assert tstz_result is not None
     
     # Timestamptz -> ULID -> Timestamptz (should preserve best)
-    tstz_round_trip = exec_one(db, "SELECT %s::timestamptz::ulid::timestamptz", (test_ts,))
+    tstz_round_trip = exec_one_cur(cur, "SELECT %s::timestamptz::ulid::timestamptz", (test_ts,))
     assert tstz_round_trip is not None
     
     print(f"✅ Timestamp precision tests completed")
@@ -438,13 +413,13 @@ def test_timestamp_precision_round_trips(db):
     print(f"   TSTZ->ULID->TSTZ: {tstz_round_trip}")
 
 
-def test_binary_round_trip_consistency(db):
+def test_binary_round_trip_consistency(cur):
     """Test that binary representations are consistent across different paths."""
     
     test_ulid = "01ARZ3NDEKTSV4RRFFQ69G5FAV"
     
     # Get the binary representation
-    binary_repr = exec_one(db, "SELECT %s::ulid::bytea", (test_ulid,))
+    binary_repr = exec_one_cur(cur, "SELECT %s::ulid::bytea", (test_ulid,))
     assert binary_repr is not None
     assert len(binary_repr) == 16
     
@@ -459,7 +434,7 @@ def test_binary_round_trip_consistency(db):
     
     for i, path in enumerate(paths):
         try:
-            result = exec_one(db, path, (test_ulid,))
+            result = exec_one_cur(cur, path, (test_ulid,))
             assert result is not None, f"Path {i+1} returned NULL"
             assert len(result) == 16, f"Path {i+1} returned invalid binary length: {len(result)}"
             # Note: We don't assert equality because some conversions may normalize the ULID
@@ -8,68 +8,23 @@ Run: pytest -q test_ulid_monotonic_pytest.py
 This suite fails loudly if the DB or required ULID functions/types are missing.
 """
 
-import pytest
 from datetime import datetime
-from conftest import exec_one, exec_fetchone, has_function, type_exists, DB_CONFIG
-import psycopg2
-
-
-@pytest.fixture(scope="module")
-def db():
-    """Module-scoped DB connection. Fail the test run if cannot connect."""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-    except Exception as exc:
-        pytest.fail(f"Cannot connect to database: {exc}", pytrace=False)
-    try:
-        yield conn
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
-
-
-def test_required_ulid_functions_and_type_present(db):
-    """Fail early if any required ULID functions or the ulid type are missing."""
-    required_funcs = [
-        "ulid",
-        "ulid_random",
-        "ulid_time",
-        "ulid_parse",
-        "ulid_batch",
-        "ulid_random_batch",
-        "ulid_timestamp",
-    ]
-    missing = [f for f in required_funcs if not has_function(db, f)]
-
-    if not type_exists(db, "ulid"):
-        missing.append("type:ulid")
-
-    if missing:
-        hint = (
-            "Install/enable the ULID extension or add missing functions/types in the test DB. "
-            "Example (superuser): CREATE EXTENSION ulid;"
-        )
-        pytest.fail(
-            f"Missing required ULID functions/types: {', '.join(missing)}. {hint}",
-            pytrace=False,
-        )
+from conftest import exec_one_cur, exec_fetchone_cur
 
 
-def test_ulid_generation_non_null(db):
+def test_ulid_generation_non_null(cur):
     """ulid() should generate a non-null value."""
-    val = exec_one(db, "SELECT ulid()")
+    val = exec_one_cur(cur, "SELECT ulid()")
     assert val is not None, "ulid() returned NULL"
 
 
-def test_monotonic_ordering_simple(db):
+def test_monotonic_ordering_simple(cur):
     """
     Calling ulid() multiple times should produce strictly increasing values
     for the sequence of calls in the same SQL statement.
     """
     # Compare three ULIDs produced in a single statement to ensure ordering
-    row = exec_fetchone(db, "SELECT ulid() AS u1, ulid() AS u2, ulid() AS u3")
+    row = exec_fetchone_cur(cur, "SELECT ulid() AS u1, ulid() AS u2, ulid() AS u3")
     assert row is not None and len(row) == 3, "Expected three ULID values"
     u1, u2, u3 = row
     assert u1 < u2, f"Expected u1 < u2, got u1={u1}, u2={u2}"
@@ -77,25 +32,25 @@ def test_monotonic_ordering_simple(db):
     assert u1 < u3, "Transitive ordering failed: u1 !< u3"
 
 
-def test_consecutive_ulids_different(db):
+def test_consecutive_ulids_different(cur):
     """Two consecutive ulid() calls should be distinct."""
-    row = exec_fetchone(db, "SELECT ulid() AS a, ulid() AS b")
+    row = exec_fetchone_cur(cur, "SELECT ulid() AS a, ulid() AS b")
     assert row is not None, "No row returned"
     a, b = row
     assert a != b, "Two consecutive ulid() calls returned equal values"
 
 
-def test_batch_monotonic_count_and_uniqueness(db):
+def test_batch_monotonic_count_and_uniqueness(cur):
     """ulid_batch(n) should return n values; unnest should yield unique values."""
-    total = exec_one(db, "SELECT array_length(ulid_batch(10), 1)")
+    total = exec_one_cur(cur, "SELECT array_length(ulid_batch(10), 1)")
     assert total == 10, f"ulid_batch(10) expected 10 elements, got {total}"
 
     # uniqueness
-    row = exec_fetchone(
-        db,
+    row = exec_fetchone_cur(
+        cur,
         """
         WITH batch AS (
-            SELECT unnest(ulid_batch(10))::text AS u
+            SELECT unnest(ulid_batch(10)) AS u
         )
         SELECT COUNT(*)::int AS total, COUNT(DISTINCT u)::int AS uniq FROM batch
         """,
@@ -105,10 +60,10 @@ def test_batch_monotonic_count_and_uniqueness(db):
     assert total == 10 and uniq == 10, f"ulid_batch produced duplicates: total={total}, uniq={uniq}"
 
 
-def test_timestamp_ordering_between_calls(db):
+def test_timestamp_ordering_between_calls(cur):
     """ULID-derived timestamps from consecutive ULID calls should be non-decreasing."""
-    row = exec_fetchone(
-        db,
+    row = exec_fetchone_cur(
+        cur,
         """
         WITH t AS (
             SELECT ulid()::timestamp AS t1, ulid()::timestamp AS t2
@@ -122,15 +77,12 @@ def test_timestamp_ordering_between_calls(db):
     assert t1 <= t2, f"Expected t1 <= t2, got t1={t1}, t2={t2}"
 
 
-def test_load_generation_count(db):
+def test_load_generation_count(cur):
     """Generate a larger set of ULIDs to ensure generation under load (count check only)."""
-    row = exec_fetchone(
-        db,
+    row = exec_fetchone_cur(
+        cur,
         """
-        WITH generated AS (
-            SELECT ulid() AS u FROM generate_series(1, 1000)
-        )
-        SELECT COUNT(*)::int FROM generated
+        SELECT COUNT(*)::int FROM generate_series(1, 1000) WHERE ulid() IS NOT NULL
         """,
     )
     assert row is not None, "Query returned no result"
@@ -138,22 +90,16 @@ def test_load_generation_count(db):
     assert count == 1000, f"Expected 1000 ULIDs in load test, got {count}"
 
 
-def test_lag_window_produces_prev_and_current_non_null_and_order(db):
+def test_batch_adjacent_pair_order(cur):
     """
-    Use LAG(ulid()) OVER (ORDER BY generate_series) to produce previous and current ULIDs.
-    Check that prev is not NULL for rows after the first and that ordering holds (prev < curr).
+    Take the first two elements of a ulid_batch() array as the previous and current ULIDs.
+    Check that neither is NULL and that ordering holds (prev < curr).
     """
-    row = exec_fetchone(
-        db,
+    row = exec_fetchone_cur(
+        cur,
         """
-        WITH lag_test AS (
-            SELECT
-                generate_series AS idx,
-                ulid() AS curr,
-                LAG(ulid()) OVER (ORDER BY generate_series) AS prev
-            FROM generate_series(1, 100)
-        )
-        SELECT prev::text, curr::text FROM lag_test WHERE prev IS NOT NULL LIMIT 1
+        SELECT a[1]::text AS prev, a[2]::text AS curr
+        FROM (SELECT ulid_batch(2) AS a) AS b
         """,
     )
     assert row is not None and len(row) == 2
@@ -162,25 +108,24 @@ def test_lag_window_produces_prev_and_current_non_null_and_order(db):
     assert prev_text < curr_text, f"Expected prev < curr, got prev={prev_text}, curr={curr_text}"
 
 
-def test_lag_multiple_rows_monotonicity(db):
+def test_batch_adjacent_pairs_monotonic(cur):
     """
-    Validate that across several rows with prev/curr pairs, prev <= curr holds and prev is not null
-    for rows after the first.
+    Validate that across adjacent prev/curr pairs of one ulid_batch() array, prev <= curr holds
+    and prev is not null for every element after the first; a[0] is out of range and yields the
+    NULL prev for the first element.
     """
-    rows_to_check = exec_fetchone(
-        db,
+    rows_to_check = exec_fetchone_cur(
+        cur,
         """
-        WITH lag_test AS (
-            SELECT
-                generate_series AS idx,
-                ulid() AS curr,
-                LAG(ulid()) OVER (ORDER BY generate_series) AS prev
-            FROM generate_series(1, 20)
+        WITH b AS (SELECT ulid_batch(20) AS a),
+        pairs AS (
+            SELECT i AS idx, a[i] AS curr, a[i - 1] AS prev
+            FROM b, generate_series(1, 20) AS i
         )
-        SELECT COUNT(*) FILTER (WHERE prev IS NULL) AS null_prev_count,
-               COUNT(*) FILTER (WHERE prev IS NOT NULL AND prev <= curr) AS nondecreasing_pairs,
-               COUNT(*) FILTER (WHERE prev IS NOT NULL) AS pairs_with_prev
-        FROM lag_test
+        SELECT SUM((prev IS NULL)::int) AS null_prev_count,
+               SUM((prev IS NOT NULL AND prev <= curr)::int) AS nondecreasing_pairs,
+               SUM((prev IS NOT NULL)::int) AS pairs_with_prev
+        FROM pairs
         """
     )
     assert rows_to_check is not None and len(rows_to_check) == 3
@@ -191,13 +136,13 @@ def test_lag_multiple_rows_monotonicity(db):
     assert nondecreasing_pairs == pairs_with_prev, "Not all prev<=curr pairs are non-decreasing"
 
 
-def test_ulid_text_ordering_matches_binary_order(db):
+def test_ulid_text_ordering_matches_binary_order(cur):
     """
     Verify that text ordering of ulid() matches binary ordering (i.e., ORDER BY ulid()::text is same direction).
     This ensures text ordering is safe for indexed ordering if ulid is stored as text.
     """
-    rows = exec_fetchone(
-        db,
+    rows = exec_fetchone_cur(
+        cur,
         """
         WITH s AS (
             SELECT generate_series as idx, ulid()::text AS t FROM generate_series(1, 10)
@@ -210,30 +155,31 @@ def test_ulid_text_ordering_matches_binary_order(db):
     assert min_t < max_t, "Expected min text < max text for generated ULIDs"
 
 
-def test_final_basic_checks(db):
+def test_final_basic_checks(cur):
     """Sanity: canonical text length is 26 and parsing is lossless (binary equality)."""
-    # text length check for a generated ULID
-    length = exec_one(db, "SELECT length(ulid()::text)")
-    assert length == 26, f"ULID text length expected 26, got {length}"
-
     # Known canonical ULID from the spec (already 26 chars)
     known = "01ARZ3NDEKTSV4RRFFQ69G5FAV"
 
-    # Compare binary representations to ensure lossless parsing / casting.
-    with db.cursor() as cur:
-        cur.execute(
-            """
-            SELECT
-                ulid_parse(%s)::text      AS parsed_text,
-                ulid_parse(%s)::bytea     AS parsed_bytes,
-                (%s::ulid)::bytea         AS direct_cast_bytes
-            """,
-            (known, known, known),
-        )
-        row = cur.fetchone()
+    # Generated-ULID text length and the binary forms of the known ULID, in one statement
+    row = exec_fetchone_cur(
+        cur,
+        """
+        WITH p AS (SELECT ulid_parse(%(known)s) AS u)
+        SELECT
+            length(ulid()::text)     AS generated_length,
+            u::text                  AS parsed_text,
+            u::bytea                 AS parsed_bytes,
+            (%(known)s::ulid)::bytea AS direct_cast_bytes
+        FROM p
+        """,
+        {"known": known},
+    )
 
     assert row is not None, "round-trip query returned no row"
-    parsed_text, parsed_bytes, direct_cast_bytes = row
+    length, parsed_text, parsed_bytes, direct_cast_bytes = row
+
+    # text length check for a generated ULID
+    assert length == 26, f"ULID text length expected 26, got {length}"
 
     # canonical textual representation length (should be 26)
     assert isinstance(parsed_text, str)
@@ -2,56 +2,46 @@
 """
 Test script to verify centralized configuration works.
 """
-import os
 import sys
 sys.path.insert(0, 'test/python')
 
-from conftest import DB_CONFIG, exec_one, has_function, type_exists
+from conftest import DB_CONFIG, exec_fetchone
 import psycopg2
 
+# SQL generator functions called when they exist in the database
+# (objectid_generate is only the C symbol behind objectid())
+GENERATORS = ["ulid_random", "objectid"]
+
 def test_centralized_config():
     """Test that centralized configuration works."""
-    print("Testing centralized configuration...")
-    print(f"DB_CONFIG: {DB_CONFIG}")
-    
-    # Test connection
+    # Short connect timeout and TCP keepalives so an unreachable server fails fast in CI
+    conn = psycopg2.connect(connect_timeout=2, keepalives=1, **DB_CONFIG)
     try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        print("✅ Database connection successful")
-        
-        # Test basic functions
-        with conn.cursor() as cursor:
-            # Test ULID functions
-            ulid_exists = has_function(cursor, 'ulid_random')
-            print(f"✅ ULID functions available: {ulid_exists}")
-            
-            # Test ObjectId functions  
-            objectid_exists = has_function(cursor, 'objectid_generate')
-            print(f"✅ ObjectId functions available: {objectid_exists}")
-            
-            # Test types
-            ulid_type_exists = type_exists(cursor, 'ulid')
-            objectid_type_exists = type_exists(cursor, 'objectid')
-            print(f"✅ ULID type exists: {ulid_type_exists}")
-            print(f"✅ ObjectId type exists: {objectid_type_exists}")
-            
-            # Test actual function calls
-            if ulid_exists:
-                ulid_result = exec_one(cursor, "SELECT ulid_random()")
-                print(f"✅ ULID generation: {ulid_result}")
-                
-            if objectid_exists:
-                objectid_result = exec_one(cursor, "SELECT objectid_generate()")
-                print(f"✅ ObjectId generation: {objectid_result}")
-        
+        # Generator functions and the ulid type probed in one round-trip, outside the
+        # system schemas like conftest._introspect
+        found, ulid_type_exists = exec_fetchone(conn, """
+            SELECT ARRAY(SELECT DISTINCT proname::text FROM pg_proc
+                         WHERE proname = ANY(%s)
+                           AND pronamespace NOT IN ('pg_catalog'::regnamespace, 'information_schema'::regnamespace)),
+                   EXISTS (SELECT 1 FROM pg_type
+                           WHERE typname = 'ulid'
+                             AND typnamespace NOT IN ('pg_catalog'::regnamespace, 'information_schema'::regnamespace))
+        """, (GENERATORS,))
+        assert ulid_type_exists, "ulid type not found"
+        present = [fn for fn in GENERATORS if fn in found]
+
+        # Call every available generator in one statement
+        if present:
+            values = exec_fetchone(conn, "SELECT " + ", ".join(f"{fn}()" for fn in present))
+            for fn, value in zip(present, values):
+                assert value is not None, f"{fn}() returned NULL"
+    finally:
         conn.close()
-        print("✅ All tests passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        return False
 
 if __name__ == "__main__":
-    success = test_centralized_config()
-    sys.exit(0 if success else 1)
+    try:
+        test_centralized_config()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print("✅ All tests passed!")